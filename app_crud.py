@@ -1,15 +1,27 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, jsonify, session
 from flask_jwt_extended import JWTManager, jwt_required, get_jwt_identity, unset_jwt_cookies, verify_jwt_in_request
 from functools import wraps
-from strawberry.flask.views import GraphQLView
 from schemas.health_schema import schema
+from utils.json_provider import OrjsonProvider, stream_json_object
 from models.health_models import CommunityHealthWorker, Patient, HealthVisit
 from routes.auth_routes import auth_bp, users as auth_users
+from routes.graphql_view import HealthGraphQLView
+from data.sample_data import generate_sample_data
 from datetime import datetime, timedelta
+from collections import defaultdict, Counter
+from heapq import nlargest
+from operator import attrgetter
 import os
 import json
+import time
+import secrets
+import logging
+import numpy as np
+import pandas as pd
 
 app = Flask(__name__)
+app.json_provider_class = OrjsonProvider
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'ict4d-secret-key-2026')
 app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-2026')
 app.config['JWT_TOKEN_LOCATION'] = ['cookies', 'headers']  # Check cookies first, then headers
@@ -53,14 +65,130 @@ def invalid_token_callback(callback):
 app.register_blueprint(auth_bp)
 
 # In-memory database
-from data.sample_data import generate_sample_data
-chws, patients, visits = generate_sample_data(30, 150, 300)
+chw_list, patients, visits = generate_sample_data(30, 150, 300)
+
+# CHWs are stored by id - the single source of truth for lookups and deletes
+chws = {c.id: c for c in chw_list}
+
+# Lookup indexes so routes avoid rescanning the lists per patient/visit
+patient_by_id = {p.id: p for p in patients}
+patients_by_chw = defaultdict(list)
+visits_by_chw = defaultdict(list)
+visits_by_patient = defaultdict(list)
+for patient in patients:
+    patients_by_chw[patient.chw_id].append(patient)
+for visit in visits:
+    visits_by_chw[visit.chw_id].append(visit)
+    visits_by_patient[visit.patient_id].append(visit)
+
+# Visit dates as one contiguous array so date-window counts run vectorized
+visit_timestamps = np.fromiter((v.visit_date.timestamp() for v in visits),
+                               dtype=np.float64, count=len(visits))
+
+# ============== DASHBOARD CACHE ==============
+
+class DashboardCache:
+    """Memoized dashboard aggregates, rebuilt after a CRUD change or when the TTL expires"""
+    
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl  # time-based metrics (visits this week) still drift without CRUD
+        self.version = 0
+        self._entries = {}
+        self._builds = 0
+        self._token = secrets.token_hex(4)  # keeps ETags unique across restarts and workers
+    
+    def invalidate(self):
+        """Mark every cached aggregate stale - call from routes that mutate data"""
+        self.version += 1
+    
+    def get(self, key, build):
+        """Return the cached value for key, calling build() only when stale"""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or entry[0] != self.version or now - entry[1] > self.ttl:
+            self._builds += 1
+            entry = (self.version, now, build(), self._builds)
+            self._entries[key] = entry
+        return entry[2]
+    
+    def etag(self, key):
+        """Validator for the value last returned by get(key)"""
+        return f"{self._token}.{self._entries[key][3]}"
+
+dashboard_cache = DashboardCache()
+
+def cached_response(key, build, render):
+    """Render a cached aggregate, or answer 304 when the client already has this version"""
+    value = dashboard_cache.get(key, build)
+    etag = dashboard_cache.etag(key)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = render(value)
+    response.set_etag(etag, weak=True)
+    return response
+
+API_STATS_FIELDS = ('total_chws', 'total_patients', 'total_visits', 'active_chws',
+                    'visits_this_week', 'patients_needing_visits')
+
+def build_dashboard_stats():
+    """Compute the headline dashboard metrics"""
+    total_visits = len(visits)
+    offline_visits = sum(v.is_offline_sync for v in visits)
+    now = datetime.now()
+    week_ago = now - timedelta(days=7)
+    overdue_cutoff = Patient.visit_cutoff(now=now)
+    offline_rate = (offline_visits / total_visits * 100) if total_visits > 0 else 0
+    
+    return {
+        'total_chws': len(chws),
+        'total_patients': len(patients),
+        'total_visits': total_visits,
+        'active_chws': sum(c.is_active for c in chws.values()),
+        'visits_this_week': int(np.count_nonzero(visit_timestamps > week_ago.timestamp())),
+        'patients_needing_visits': sum(1 for p in patients if p.needs_visit(cutoff=overdue_cutoff)),
+        'offline_rate': round(offline_rate, 1),
+        'recent_visits': nlargest(10, visits, key=attrgetter('visit_date'))
+    }
+
+def build_district_stats():
+    """Per-district CHW, patient and visit counts"""
+    district_chws = Counter(c.district for c in chws.values())
+    district_patients = Counter(chws[p.chw_id].district for p in patients if p.chw_id in chws)
+    district_visits = Counter(chws[v.chw_id].district for v in visits if v.chw_id in chws)
+    
+    return {
+        district: {
+            'chws': count,
+            'patients': district_patients[district],
+            'visits': district_visits[district]
+        }
+        for district, count in district_chws.items()
+    }
+
+def build_chw_frame():
+    """Columnar view of the CHW filter fields, row-aligned with the returned list"""
+    records = list(chws.values())
+    frame = pd.DataFrame({
+        'district': [c.district for c in records],
+        'is_active': np.fromiter((c.is_active for c in records), dtype=bool, count=len(records))
+    })
+    return records, frame
+
+def build_patient_frame():
+    """Columnar view of the patient filter fields, row-aligned with the returned list"""
+    records = list(patients)
+    frame = pd.DataFrame({
+        'chw_id': [p.chw_id for p in records],
+        'last_visit_date': pd.to_datetime([p.last_visit_date for p in records])
+    })
+    return records, frame
 
 # Merge users from auth blueprint for template access
 users = auth_users
 
 # Add GraphQL endpoint
-app.add_url_rule('/graphql', view_func=GraphQLView.as_view('graphql', schema=schema, graphiql=True))
+app.add_url_rule('/graphql', view_func=HealthGraphQLView.as_view('graphql', schema=schema, graphiql=True))
 
 # ============== JWT PROTECTED ROUTES ==============
 @app.route('/')
@@ -68,63 +196,25 @@ app.add_url_rule('/graphql', view_func=GraphQLView.as_view('graphql', schema=sch
 def index():
     """Main dashboard with key ICT4D metrics"""
     # Get current user
-    current_email = get_jwt_identity()
-    current_user = users.get(current_email)
+    current_user = users.get_by_id(get_jwt_identity())
     
     if not current_user:
         return redirect(url_for('auth.login_page'))
     
-    # Calculate basic metrics
-    total_chws = len(chws)
-    total_patients = len(patients)
-    total_visits = len(visits)
-    active_chws = len([c for c in chws if c.is_active])
-    visits_this_week = len([v for v in visits 
-                           if v.visit_date > datetime.now() - timedelta(days=7)])
-    
-    # FIX: Calculate patients needing visits
-    patients_needing_visits = len([p for p in patients if p.needs_visit()])
-    
-    # Calculate offline rate
-    offline_visits = len([v for v in visits if v.is_offline_sync])
-    offline_rate = (offline_visits / total_visits * 100) if total_visits > 0 else 0
-    
-    # District breakdown
-    districts = {}
-    for chw in chws:
-        if chw.district not in districts:
-            districts[chw.district] = {
-                'chws': 0,
-                'patients': 0,
-                'visits': 0
-            }
-        districts[chw.district]['chws'] += 1
-    
-    for patient in patients:
-        chw = next((c for c in chws if c.id == patient.chw_id), None)
-        if chw and chw.district in districts:
-            districts[chw.district]['patients'] += 1
-    
-    for visit in visits:
-        chw = next((c for c in chws if c.id == visit.chw_id), None)
-        if chw and chw.district in districts:
-            districts[chw.district]['visits'] += 1
-    
-    # Recent activities
-    recent_visits = sorted(visits, key=lambda x: x.visit_date, reverse=True)[:10]
+    stats = dashboard_cache.get('dashboard', build_dashboard_stats)
     
     return render_template('dashboard.html',
-                         total_chws=total_chws,
-                         total_patients=total_patients,
-                         total_visits=total_visits,
-                         active_chws=active_chws,
-                         visits_this_week=visits_this_week,
-                         patients_needing_visits=patients_needing_visits,  # Now defined
-                         districts=districts,
-                         recent_visits=recent_visits,
-                         chws=chws,
+                         total_chws=stats['total_chws'],
+                         total_patients=stats['total_patients'],
+                         total_visits=stats['total_visits'],
+                         active_chws=stats['active_chws'],
+                         visits_this_week=stats['visits_this_week'],
+                         patients_needing_visits=stats['patients_needing_visits'],
+                         districts=dashboard_cache.get('districts', build_district_stats),
+                         recent_visits=stats['recent_visits'],
+                         chws=list(chws.values()),
                          patients=patients,
-                         offline_rate=round(offline_rate, 1),
+                         offline_rate=stats['offline_rate'],
                          current_user=current_user)
 
 # ============== CHW CRUD ROUTES ==============
@@ -135,15 +225,17 @@ def list_chws():
     district = request.args.get('district')
     status = request.args.get('status')
     
-    filtered_chws = chws
+    records, frame = dashboard_cache.get('chw_frame', build_chw_frame)
+    mask = np.ones(len(records), dtype=bool)
     if district:
-        filtered_chws = [c for c in filtered_chws if c.district == district]
+        mask &= frame['district'].to_numpy() == district
     if status == 'active':
-        filtered_chws = [c for c in filtered_chws if c.is_active]
+        mask &= frame['is_active'].to_numpy()
     elif status == 'inactive':
-        filtered_chws = [c for c in filtered_chws if not c.is_active]
+        mask &= ~frame['is_active'].to_numpy()
+    filtered_chws = [records[i] for i in np.flatnonzero(mask)]
     
-    districts = sorted(set(c.district for c in chws))
+    districts = sorted(frame['district'].unique())
     return render_template('chw_list.html', 
                          chws=filtered_chws, 
                          districts=districts,
@@ -154,7 +246,10 @@ def list_chws():
 def create_chw():
     """Create new CHW"""
     if request.method == 'POST':
-        new_id = f"CHW{len(chws)+1:03d}"
+        next_number = len(chws) + 1
+        while f"CHW{next_number:03d}" in chws:
+            next_number += 1
+        new_id = f"CHW{next_number:03d}"
         chw = CommunityHealthWorker(
             id=new_id,
             name=request.form['name'],
@@ -163,7 +258,8 @@ def create_chw():
             phone=request.form['phone'],
             is_active='is_active' in request.form
         )
-        chws.append(chw)
+        chws[chw.id] = chw
+        dashboard_cache.invalidate()
         flash(f'CHW {chw.name} created successfully!', 'success')
         return redirect(url_for('list_chws'))
     
@@ -173,7 +269,7 @@ def create_chw():
 @app.route('/chws/<chw_id>/edit', methods=['GET', 'POST'])
 def edit_chw(chw_id):
     """Edit existing CHW"""
-    chw = next((c for c in chws if c.id == chw_id), None)
+    chw = chws.get(chw_id)
     if not chw:
         flash('CHW not found!', 'error')
         return redirect(url_for('list_chws'))
@@ -184,6 +280,7 @@ def edit_chw(chw_id):
         chw.district = request.form['district']
         chw.phone = request.form['phone']
         chw.is_active = 'is_active' in request.form
+        dashboard_cache.invalidate()
         flash(f'CHW {chw.name} updated successfully!', 'success')
         return redirect(url_for('list_chws'))
     
@@ -193,10 +290,9 @@ def edit_chw(chw_id):
 @app.route('/chws/<chw_id>/delete', methods=['POST'])
 def delete_chw(chw_id):
     """Delete CHW"""
-    global chws
-    chw = next((c for c in chws if c.id == chw_id), None)
+    chw = chws.pop(chw_id, None)
     if chw:
-        chws = [c for c in chws if c.id != chw_id]
+        dashboard_cache.invalidate()
         flash(f'CHW {chw.name} deleted successfully!', 'success')
     return redirect(url_for('list_chws'))
 
@@ -204,32 +300,35 @@ def delete_chw(chw_id):
 def view_chw(chw_id):
     """View CHW details with their patients and visits"""
     print(f"Looking for CHW with ID: {chw_id}")  # Debug print
-    print(f"Available CHW IDs: {[c.id for c in chws]}")  # Debug print
+    print(f"Available CHW IDs: {list(chws)}")  # Debug print
     
-    chw = next((c for c in chws if c.id == chw_id), None)
+    chw = chws.get(chw_id)
     if not chw:
         print(f"CHW {chw_id} not found!")  # Debug print
         flash(f'CHW with ID {chw_id} not found!', 'error')
         return redirect(url_for('list_chws'))
     
-    chw_patients = [p for p in patients if p.chw_id == chw_id]
-    chw_visits = [v for v in visits if v.chw_id == chw_id]
+    chw_patients = patients_by_chw[chw_id]
+    chw_visits = visits_by_chw[chw_id]
     
     # Statistics
     total_patients = len(chw_patients)
     total_visits = len(chw_visits)
-    visits_this_month = len([v for v in chw_visits 
-                            if v.visit_date > datetime.now() - timedelta(days=30)])
-    patients_needing_visits = len([p for p in chw_patients if p.needs_visit()])
+    now = datetime.now()
+    month_ago = now - timedelta(days=30)
+    visits_this_month = sum(1 for v in chw_visits if v.visit_date > month_ago)
+    overdue_cutoff = Patient.visit_cutoff(now=now)
+    patients_needing_visits = sum(1 for p in chw_patients if p.needs_visit(cutoff=overdue_cutoff))
     
     return render_template('chw_view.html',
                          chw=chw,
                          patients=chw_patients,
-                         visits=sorted(chw_visits, key=lambda x: x.visit_date, reverse=True)[:20],
+                         visits=nlargest(20, chw_visits, key=attrgetter('visit_date')),
                          total_patients=total_patients,
                          total_visits=total_visits,
                          visits_this_month=visits_this_month,
-                         patients_needing_visits=patients_needing_visits)
+                         patients_needing_visits=patients_needing_visits,
+                         overdue_cutoff=overdue_cutoff)
 
 # ============== PATIENT CRUD ROUTES ==============
 
@@ -239,16 +338,22 @@ def list_patients():
     chw_id = request.args.get('chw_id')
     needs_visit = request.args.get('needs_visit')
     
-    filtered_patients = patients
+    overdue_cutoff = Patient.visit_cutoff()
+    records, frame = dashboard_cache.get('patient_frame', build_patient_frame)
+    mask = np.ones(len(records), dtype=bool)
     if chw_id:
-        filtered_patients = [p for p in filtered_patients if p.chw_id == chw_id]
+        mask &= frame['chw_id'].to_numpy() == chw_id
     if needs_visit:
-        filtered_patients = [p for p in filtered_patients if p.needs_visit()]
+        # Same rule as Patient.needs_visit(): never visited, or on/before the cutoff
+        last_visit = frame['last_visit_date']
+        mask &= (last_visit.isna() | (last_visit <= overdue_cutoff)).to_numpy()
+    filtered_patients = [records[i] for i in np.flatnonzero(mask)]
     
     return render_template('patient_list.html', 
                          patients=filtered_patients,
-                         chws=chws,
-                         selected_chw=chw_id)
+                         chws=list(chws.values()),
+                         selected_chw=chw_id,
+                         overdue_cutoff=overdue_cutoff)
 
 @app.route('/patients/new', methods=['GET', 'POST'])
 def create_patient():
@@ -265,21 +370,24 @@ def create_patient():
             has_chronic_condition='has_chronic_condition' in request.form
         )
         patients.append(patient)
+        patient_by_id[patient.id] = patient
+        patients_by_chw[patient.chw_id].append(patient)
         
         # Add to CHW's patient list
-        chw = next((c for c in chws if c.id == patient.chw_id), None)
+        chw = chws.get(patient.chw_id)
         if chw:
             chw.patients_assigned.append(patient.id)
         
+        dashboard_cache.invalidate()
         flash(f'Patient {patient.name} registered successfully!', 'success')
         return redirect(url_for('list_patients'))
     
-    return render_template('patient_form.html', patient=None, chws=chws)
+    return render_template('patient_form.html', patient=None, chws=list(chws.values()))
 
 @app.route('/patients/<patient_id>/edit', methods=['GET', 'POST'])
 def edit_patient(patient_id):
     """Edit patient"""
-    patient = next((p for p in patients if p.id == patient_id), None)
+    patient = patient_by_id.get(patient_id)
     if not patient:
         flash('Patient not found!', 'error')
         return redirect(url_for('list_patients'))
@@ -293,45 +401,50 @@ def edit_patient(patient_id):
         new_chw_id = request.form['chw_id']
         if new_chw_id != patient.chw_id:
             # Remove from old CHW
-            old_chw = next((c for c in chws if c.id == patient.chw_id), None)
+            old_chw = chws.get(patient.chw_id)
             if old_chw and patient.id in old_chw.patients_assigned:
                 old_chw.patients_assigned.remove(patient.id)
+            if patient in patients_by_chw[patient.chw_id]:
+                patients_by_chw[patient.chw_id].remove(patient)
             
             # Add to new CHW
             patient.chw_id = new_chw_id
-            new_chw = next((c for c in chws if c.id == new_chw_id), None)
+            patients_by_chw[new_chw_id].append(patient)
+            new_chw = chws.get(new_chw_id)
             if new_chw:
                 new_chw.patients_assigned.append(patient.id)
         
         patient.is_pregnant = 'is_pregnant' in request.form
         patient.has_chronic_condition = 'has_chronic_condition' in request.form
         
+        dashboard_cache.invalidate()
         flash(f'Patient {patient.name} updated successfully!', 'success')
         return redirect(url_for('view_patient', patient_id=patient.id))
     
-    return render_template('patient_form.html', patient=patient, chws=chws)
+    return render_template('patient_form.html', patient=patient, chws=list(chws.values()))
 
 @app.route('/patients/<patient_id>')
 def view_patient(patient_id):
     """View patient details"""
-    patient = next((p for p in patients if p.id == patient_id), None)
+    patient = patient_by_id.get(patient_id)
     if not patient:
         flash('Patient not found!', 'error')
         return redirect(url_for('list_patients'))
     
-    chw = next((c for c in chws if c.id == patient.chw_id), None)
-    patient_visits = [v for v in visits if v.patient_id == patient_id]
+    chw = chws.get(patient.chw_id)
+    patient_visits = visits_by_patient[patient_id]
     
     return render_template('patient_view.html',
                          patient=patient,
                          chw=chw,
-                         visits=sorted(patient_visits, key=lambda x: x.visit_date, reverse=True))
+                         visits=sorted(patient_visits, key=attrgetter('visit_date'), reverse=True))
 
 # ============== VISIT CRUD ROUTES ==============
 
 @app.route('/visits/new', methods=['GET', 'POST'])
 def create_visit():
     """Record a new health visit"""
+    global visit_timestamps
     if request.method == 'POST':
         new_id = f"VIS{len(visits)+1:05d}"
         visit = HealthVisit(
@@ -344,12 +457,16 @@ def create_visit():
             is_offline_sync='is_offline_sync' in request.form
         )
         visits.append(visit)
+        visits_by_chw[visit.chw_id].append(visit)
+        visits_by_patient[visit.patient_id].append(visit)
+        visit_timestamps = np.append(visit_timestamps, visit.visit_date.timestamp())
         
         # Update patient's last visit
-        patient = next((p for p in patients if p.id == visit.patient_id), None)
+        patient = patient_by_id.get(visit.patient_id)
         if patient:
             patient.last_visit_date = visit.visit_date
         
+        dashboard_cache.invalidate()
         flash('Visit recorded successfully!', 'success')
         return redirect(url_for('index'))
     
@@ -359,7 +476,7 @@ def create_visit():
     
     return render_template('visit_form.html', 
                          patients=patients, 
-                         chws=chws,
+                         chws=list(chws.values()),
                          selected_patient=patient_id,
                          selected_chw=chw_id,
                          today=datetime.now().strftime('%Y-%m-%d'))
@@ -370,42 +487,20 @@ def create_visit():
 @jwt_required()
 def api_stats():
     """JSON API for dashboard updates"""
-    return jsonify({
-        'total_chws': len(chws),
-        'total_patients': len(patients),
-        'total_visits': len(visits),
-        'active_chws': len([c for c in chws if c.is_active]),
-        'visits_this_week': len([v for v in visits 
-                                if v.visit_date > datetime.now() - timedelta(days=7)]),
-        'patients_needing_visits': len([p for p in patients if p.needs_visit()])
-    })
+    return cached_response('dashboard', build_dashboard_stats,
+                           lambda stats: jsonify({key: stats[key] for key in API_STATS_FIELDS}))
 
 @app.route('/api/district_stats')
 def api_district_stats():
-    """District-level statistics for charts"""
-    stats = {}
-    for chw in chws:
-        if chw.district not in stats:
-            stats[chw.district] = {
-                'chws': 0,
-                'patients': 0,
-                'visits': 0
-            }
-        stats[chw.district]['chws'] += 1
-    
-    for patient in patients:
-        chw = next((c for c in chws if c.id == patient.chw_id), None)
-        if chw and chw.district in stats:
-            stats[chw.district]['patients'] += 1
-    
-    for visit in visits:
-        chw = next((c for c in chws if c.id == visit.chw_id), None)
-        if chw and chw.district in stats:
-            stats[chw.district]['visits'] += 1
-    
-    return jsonify(stats)
+    """District-level statistics for charts, streamed one district at a time"""
+    return cached_response('districts', build_district_stats,
+                           lambda stats: Response(stream_json_object(stats.items()),
+                                                  mimetype='application/json',
+                                                  direct_passthrough=True))
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG)
+    
     print("\n" + "="*60)
     print("🏥 ICT4D Health Worker CRUD App with Dashboard")
     print("="*60)
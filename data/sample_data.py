@@ -1,13 +1,21 @@
-from models.health_models import CommunityHealthWorker, Patient, HealthVisit
+from models.health_models import CommunityHealthWorker, Patient, HealthVisit, VISIT_TYPES
 from datetime import datetime, timedelta
-import random
+import numpy as np
 from faker import Faker
 
 fake = Faker()
+rng = np.random.default_rng()
+
+VISIT_TYPE_WEIGHTS = [0.6, 0.3, 0.1]  # same order as VISIT_TYPES
+
+def _random_datetimes(start: datetime, end: datetime, size: int):
+    """Draw `size` datetimes uniformly between start and end in one call"""
+    stamps = rng.integers(int(start.timestamp()), int(end.timestamp()), size=size)
+    return [datetime.fromtimestamp(ts) for ts in stamps.tolist()]
 
 def generate_sample_data(num_chws: int = 30, num_patients: int = 150, num_visits: int = 300):
     """Generate realistic sample data for ICT4D demonstration"""
-    
+
     districts = ["Turkana", "Elgeyo-Marakwet", "Kajiado", "Nairobi"]
     villages = {
         "Turkana": ["Lodwar", "Kakuma", "Lokitaung"],
@@ -15,63 +23,79 @@ def generate_sample_data(num_chws: int = 30, num_patients: int = 150, num_visits
         "Kajiado": ["Kajiado Town", "Ngong", "Kitengela"],
         "Nairobi": ["Kibera", "Mathare", "Kawangware"]
     }
-    
+
     chws = []
     patients = []
     visits = []
-    
-    # Generate CHWs
+    now = datetime.now()
+
+    # Generate CHWs - draw every random attribute up front, then zip into models
+    chw_districts = rng.choice(districts, size=num_chws).tolist()
+    village_picks = rng.random(num_chws).tolist()
+    chw_villages = [villages[d][int(r * len(villages[d]))] for d, r in zip(chw_districts, village_picks)]
+    chw_active = (rng.random(num_chws) > 0.1).tolist()  # 90% active
+    chw_registered = _random_datetimes(now - timedelta(days=730), now, num_chws)
+    chw_names = [fake.name() for _ in range(num_chws)]
+    chw_phones = [fake.phone_number() for _ in range(num_chws)]
+
     for i in range(num_chws):
-        district = random.choice(districts)
         chw = CommunityHealthWorker(
             id=f"CHW{i:03d}",
-            name=fake.name(),
-            village=random.choice(villages[district]),
-            district=district,
-            phone=fake.phone_number(),
-            is_active=random.random() > 0.1,  # 90% active
-            date_registered=fake.date_time_between(start_date='-2y', end_date='now')
+            name=chw_names[i],
+            village=chw_villages[i],
+            district=chw_districts[i],
+            phone=chw_phones[i],
+            is_active=chw_active[i],
+            date_registered=chw_registered[i]
         )
         chws.append(chw)
-    
+
     # Generate patients and assign to CHWs
+    patient_chws = rng.integers(0, num_chws, size=num_patients).tolist()
+    patient_ages = rng.integers(1, 81, size=num_patients).tolist()
+    patient_pregnant = (rng.random(num_patients) > 0.7).tolist()
+    patient_chronic = (rng.random(num_patients) > 0.8).tolist()
+    patient_names = [fake.name() for _ in range(num_patients)]
+
     for i in range(num_patients):
-        chw = random.choice(chws)
+        chw = chws[patient_chws[i]]
         patient = Patient(
             id=f"PAT{i:04d}",
-            name=fake.name(),
-            age=random.randint(1, 80),
+            name=patient_names[i],
+            age=patient_ages[i],
             village=chw.village,
             chw_id=chw.id,
-            is_pregnant=random.random() > 0.7 if random.randint(15, 45) else False,
-            has_chronic_condition=random.random() > 0.8,
+            is_pregnant=patient_pregnant[i],
+            has_chronic_condition=patient_chronic[i],
             last_visit_date=None
         )
         patients.append(patient)
         chw.patients_assigned.append(patient.id)
-    
+
     # Generate visits
+    visit_patients = rng.integers(0, num_patients, size=num_visits).tolist()
+    visit_dates = _random_datetimes(now - timedelta(days=182), now, num_visits)
+    visit_types = rng.choice(VISIT_TYPES, size=num_visits, p=VISIT_TYPE_WEIGHTS).tolist()
+    visit_offline = (rng.random(num_visits) > 0.4).tolist()  # 60% of visits done offline
+    visit_notes = [fake.sentence() for _ in range(num_visits)]
+
     for i in range(num_visits):
-        patient = random.choice(patients)
-        chw = next(c for c in chws if c.id == patient.chw_id)
-        visit_date = fake.date_time_between(start_date='-6m', end_date='now')
-        
+        patient = patients[visit_patients[i]]
+        visit_date = visit_dates[i]
+
         visit = HealthVisit(
             id=f"VIS{i:05d}",
             patient_id=patient.id,
-            chw_id=chw.id,
+            chw_id=patient.chw_id,
             visit_date=visit_date,
-            visit_type=random.choices(
-                ["routine", "follow-up", "emergency"],
-                weights=[0.6, 0.3, 0.1]
-            )[0],
-            notes=fake.sentence(),
-            is_offline_sync=random.random() > 0.4  # 60% of visits done offline
+            visit_type=visit_types[i],
+            notes=visit_notes[i],
+            is_offline_sync=visit_offline[i]
         )
         visits.append(visit)
-        
+
         # Update patient's last visit
         if not patient.last_visit_date or visit_date > patient.last_visit_date:
             patient.last_visit_date = visit_date
-    
-    return chws, patients, visits
\ No newline at end of file
+
+    return chws, patients, visits
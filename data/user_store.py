@@ -0,0 +1,173 @@
+import copy
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from models.user import User
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    is_active INTEGER NOT NULL,
+    created_at TEXT,
+    last_login TEXT,
+    reset_token TEXT,
+    reset_token_expiry TEXT
+);
+CREATE INDEX IF NOT EXISTS users_reset_token ON users (reset_token);
+"""
+
+_COLUMNS = ('id', 'email', 'password_hash', 'full_name', 'role', 'is_active',
+            'created_at', 'last_login', 'reset_token', 'reset_token_expiry')
+
+_INSERT = f"INSERT INTO users ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})"
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def _to_column(value):
+    return _to_text(value) if isinstance(value, datetime) else value
+
+def _user_values(user: User) -> list:
+    return [_to_column(getattr(user, c)) for c in _COLUMNS]
+
+def _row_to_user(row) -> User:
+    return User(
+        id=row['id'],
+        email=row['email'],
+        password_hash=row['password_hash'],
+        full_name=row['full_name'],
+        role=row['role'],
+        is_active=bool(row['is_active']),
+        created_at=_to_datetime(row['created_at']),
+        last_login=_to_datetime(row['last_login']),
+        reset_token=row['reset_token'],
+        reset_token_expiry=_to_datetime(row['reset_token_expiry'])
+    )
+
+
+class UserStore:
+    """SQLite user table shared by all workers, used like the old `{email: User}` dict
+
+    Reads go through a small in-process LRU. It is cleared on our own writes and
+    whenever SQLite's data_version shows another connection (worker) committed.
+    Callers get their own copy of each User; new users go in with add() and
+    changes are written column by column with update(), so concurrent requests
+    only overwrite the fields they actually changed.
+    """
+
+    def __init__(self, path: str, cache_size: int = 1024):
+        self.path = path
+        self._local = threading.local()
+        self._cached_by_email = lru_cache(maxsize=cache_size)(self._fetch_by_email)
+        self._cached_by_id = lru_cache(maxsize=cache_size)(self._fetch_by_id)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """One autocommit connection per thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            self._local.data_version = None
+        return conn
+
+    def _clear_cache(self):
+        self._cached_by_email.cache_clear()
+        self._cached_by_id.cache_clear()
+
+    def _check_external_writes(self):
+        """Drop cached users if another connection has committed since this thread last looked"""
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        seen = self._local.data_version
+        self._local.data_version = version
+        # A thread's first check only seeds the version - our own writes clear the cache
+        # directly, and data_version is per-connection so a fresh one has nothing to compare
+        if seen is not None and version != seen:
+            self._clear_cache()
+
+    def _fetch_one(self, column: str, value) -> Optional[User]:
+        row = self._connection().execute(
+            f"SELECT * FROM users WHERE {column} = ?", (value,)).fetchone()
+        if not row:
+            return None
+        user = _row_to_user(row)
+        user.to_dict()  # build the serialized form once; copies share it
+        return user
+
+    def _fetch_by_email(self, email: str) -> Optional[User]:
+        return self._fetch_one('email', email)
+
+    def _fetch_by_id(self, user_id: str) -> Optional[User]:
+        return self._fetch_one('id', user_id)
+
+    # ---- dict-style API keyed by email ----
+
+    def get(self, email: str, default=None) -> Optional[User]:
+        self._check_external_writes()
+        user = self._cached_by_email(email)
+        return copy.copy(user) if user is not None else default
+
+    def __getitem__(self, email: str) -> User:
+        user = self.get(email)
+        if user is None:
+            raise KeyError(email)
+        return user
+
+    def __contains__(self, email: str) -> bool:
+        return self.get(email) is not None
+
+    def add(self, user: User) -> bool:
+        """Insert a new user - False if the email (or id) is already taken"""
+        try:
+            self._connection().execute(_INSERT, _user_values(user))
+        except sqlite3.IntegrityError:
+            return False
+        self._clear_cache()
+        return True
+
+    def update(self, user_id: str, expected: Optional[dict] = None, **fields) -> bool:
+        """Set only the given columns on one user - False if no row matched
+
+        `expected` adds `column = value` guards, e.g. the password hash that was just
+        verified, so the write is skipped if another request changed it meanwhile.
+        """
+        expected = expected or {}
+        for column in (*fields, *expected):
+            if column not in _COLUMNS or column == 'id':
+                raise ValueError(f"Unknown user column: {column}")
+        sql = f"UPDATE users SET {', '.join(f'{c} = ?' for c in fields)} WHERE id = ?"
+        sql += "".join(f" AND {c} IS ?" for c in expected)
+        params = [_to_column(v) for v in fields.values()] + [user_id]
+        params += [_to_column(v) for v in expected.values()]
+        cursor = self._connection().execute(sql, params)
+        self._clear_cache()
+        return cursor.rowcount > 0
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def keys(self):
+        return [row['email'] for row in self._connection().execute("SELECT email FROM users")]
+
+    # ---- secondary lookups ----
+
+    def get_by_id(self, user_id: str) -> Optional[User]:
+        self._check_external_writes()
+        user = self._cached_by_id(user_id)
+        return copy.copy(user) if user is not None else None
+
+    def get_by_reset_token(self, token_hash: str) -> Optional[User]:
+        return self._fetch_one('reset_token', token_hash)
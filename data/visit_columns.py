@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Tuple
+import numpy as np
+from models.health_models import ROUTINE, EMERGENCY, VISIT_TYPES
+
+# visit_type strings encoded as uint8 codes; anything unrecognised gets OTHER_VISIT_TYPE
+VISIT_TYPE_CODES = {visit_type: code for code, visit_type in enumerate(VISIT_TYPES)}
+OTHER_VISIT_TYPE = len(VISIT_TYPES)
+ROUTINE_CODE = VISIT_TYPE_CODES[ROUTINE]
+EMERGENCY_CODE = VISIT_TYPE_CODES[EMERGENCY]
+
+@dataclass(slots=True)
+class VisitColumns:
+    """Column-wise (struct of arrays) copy of the visits list for aggregate queries
+
+    The HealthVisit objects stay the source of truth for single-visit resolvers;
+    rebuild this whenever the visits list changes.
+    """
+    chw_codes: Dict[str, int]   # CHW id -> chw code
+    chw_code: np.ndarray        # int32, one per visit
+    type_code: np.ndarray       # uint8, one per visit
+    is_offline: np.ndarray      # bool, one per visit
+    visit_date: np.ndarray      # datetime64[us], one per visit
+    # Per-CHW totals indexed by chw code, precomputed with bincount
+    total_by_chw: np.ndarray
+    routine_by_chw: np.ndarray
+    emergency_by_chw: np.ndarray
+    offline_by_chw: np.ndarray
+
+    @classmethod
+    def from_visits(cls, visits) -> "VisitColumns":
+        chw_codes = {}
+        chw_code = np.fromiter((chw_codes.setdefault(v.chw_id, len(chw_codes)) for v in visits),
+                               dtype=np.int32, count=len(visits))
+        type_code = np.fromiter((VISIT_TYPE_CODES.get(v.visit_type, OTHER_VISIT_TYPE) for v in visits),
+                                dtype=np.uint8, count=len(visits))
+        is_offline = np.fromiter((v.is_offline_sync for v in visits), dtype=bool, count=len(visits))
+        visit_date = np.array([v.visit_date for v in visits], dtype='datetime64[us]')
+
+        n = len(chw_codes)
+        return cls(
+            chw_codes=chw_codes,
+            chw_code=chw_code,
+            type_code=type_code,
+            is_offline=is_offline,
+            visit_date=visit_date,
+            total_by_chw=np.bincount(chw_code, minlength=n),
+            routine_by_chw=np.bincount(chw_code[type_code == ROUTINE_CODE], minlength=n),
+            emergency_by_chw=np.bincount(chw_code[type_code == EMERGENCY_CODE], minlength=n),
+            offline_by_chw=np.bincount(chw_code[is_offline], minlength=n)
+        )
+
+    def chw_stats(self, chw_id: str) -> Tuple[int, int, int, int]:
+        """(total, routine, emergency, offline) visit counts for one CHW"""
+        code = self.chw_codes.get(chw_id)
+        if code is None:
+            return 0, 0, 0, 0
+        return (int(self.total_by_chw[code]), int(self.routine_by_chw[code]),
+                int(self.emergency_by_chw[code]), int(self.offline_by_chw[code]))
+
+    def offline_summary(self, since: datetime) -> Tuple[int, int, int]:
+        """(offline visits, CHWs with offline visits, offline visits after `since`)"""
+        offline_dates = self.visit_date[self.is_offline]
+        return (int(offline_dates.size),
+                int(np.count_nonzero(self.offline_by_chw)),
+                int(np.count_nonzero(offline_dates > np.datetime64(since, 'us'))))
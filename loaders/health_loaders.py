@@ -0,0 +1,37 @@
+from strawberry.dataloader import DataLoader
+
+
+class IndexLoader(DataLoader):
+    """DataLoader that resolves a whole batch of keys from an in-memory index"""
+    
+    def __init__(self, index, default=None):
+        async def load_from_index(keys):
+            return [index.get(key, default) for key in keys]
+        super().__init__(load_fn=load_from_index)
+
+
+class ListIndexLoader(IndexLoader):
+    """IndexLoader for one-to-many indexes - missing keys load as an empty list"""
+    
+    def __init__(self, index):
+        super().__init__(index, default=[])
+
+
+class ChwLoader(IndexLoader):
+    """Loads Community Health Workers by id"""
+
+
+class PatientLoader(IndexLoader):
+    """Loads patients by id"""
+
+
+class PatientsByChwLoader(ListIndexLoader):
+    """Loads the list of patients assigned to each CHW"""
+
+
+class VisitsByChwLoader(ListIndexLoader):
+    """Loads the list of visits recorded by each CHW"""
+
+
+class VisitsByPatientLoader(ListIndexLoader):
+    """Loads the list of visits for each patient"""
@@ -1,9 +1,16 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional
 from dataclasses import dataclass, field
 import random
+import sys
 
-@dataclass
+# Visit types - interned so every HealthVisit shares one string object per type
+ROUTINE = sys.intern("routine")
+FOLLOW_UP = sys.intern("follow-up")
+EMERGENCY = sys.intern("emergency")
+VISIT_TYPES = [ROUTINE, FOLLOW_UP, EMERGENCY]  # order fixes the uint8 codes in VisitColumns
+
+@dataclass(slots=True)
 class CommunityHealthWorker:
     """Model representing a CHW - core to ICT4D programs"""
     id: str
@@ -15,12 +22,12 @@ class CommunityHealthWorker:
     date_registered: datetime = field(default_factory=datetime.now)
     patients_assigned: List[str] = field(default_factory=list)
     
-    def years_active(self) -> float:
+    def years_active(self, now: Optional[datetime] = None) -> float:
         """Calculate years of service"""
-        days = (datetime.now() - self.date_registered).days
+        days = ((now or datetime.now()) - self.date_registered).days
         return round(days / 365.25, 1)
 
-@dataclass
+@dataclass(slots=True)
 class Patient:
     """Model representing a patient in the program"""
     id: str
@@ -32,15 +39,22 @@ class Patient:
     has_chronic_condition: bool = False
     last_visit_date: Optional[datetime] = None
     
-    def needs_visit(self, days_threshold: int = 30) -> bool:
-        """Check if patient needs a follow-up visit"""
+    @staticmethod
+    def visit_cutoff(days_threshold: int = 30, now: Optional[datetime] = None) -> datetime:
+        """Latest last-visit date that counts as overdue (more than N whole days ago)"""
+        return (now or datetime.now()) - timedelta(days=days_threshold + 1)
+    
+    def needs_visit(self, days_threshold: int = 30, now: Optional[datetime] = None,
+                    cutoff: Optional[datetime] = None) -> bool:
+        """Check if patient needs a follow-up visit (pass a shared `cutoff` when checking many patients)"""
         if not self.last_visit_date:
             return True
-        days_since = (datetime.now() - self.last_visit_date).days
-        return days_since > days_threshold
+        if cutoff is None:
+            cutoff = self.visit_cutoff(days_threshold, now)
+        return self.last_visit_date <= cutoff
         
 
-@dataclass
+@dataclass(slots=True)
 class HealthVisit:
     """Model representing a health visit - key for MEAL tracking"""
     id: str
@@ -53,6 +67,10 @@ class HealthVisit:
     location_lon: Optional[float] = None
     is_offline_sync: bool = False  # Important for low-bandwidth scenarios
     
+    def __post_init__(self):
+        # Values from forms and NumPy draws are fresh strings - swap in the shared one
+        self.visit_type = sys.intern(self.visit_type)
+    
     @property
     def visit_summary(self) -> str:
         """Generate a summary for reports"""
@@ -2,8 +2,16 @@ from datetime import datetime
 from dataclasses import dataclass, field
 from typing import List
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 
-@dataclass
+# Argon2id with the OWASP minimum profile (19 MiB, 2 passes, 1 lane)
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+LEGACY_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+# Fields that appear in to_dict() - assigning any of them drops the cached dict
+_DICT_FIELDS = frozenset({'id', 'email', 'full_name', 'role', 'is_active', 'created_at', 'last_login'})
+
+@dataclass(slots=True)
 class User:
     """User model for authentication"""
     id: str
@@ -16,22 +24,50 @@ class User:
     last_login: datetime = None
     reset_token: str = None
     reset_token_expiry: datetime = None
+    _dict_cache: dict = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        if name in _DICT_FIELDS:
+            object.__setattr__(self, '_dict_cache', None)
+        object.__setattr__(self, name, value)
+    
+    def __copy__(self):
+        """Field-for-field copy that keeps the cached to_dict() result"""
+        clone = object.__new__(User)
+        for name in self.__slots__:
+            object.__setattr__(clone, name, getattr(self, name))
+        return clone
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """Hash a password using Argon2id"""
+        return password_hasher.hash(password)
     
     def verify_password(self, password: str) -> bool:
-        """Verify a password against the hash"""
-        return bcrypt.checkpw(
-            password.encode('utf-8'), 
-            self.password_hash.encode('utf-8')
-        )
+        """Verify a password against the hash (Argon2id, or a legacy bcrypt hash)"""
+        if self.password_hash.startswith(LEGACY_BCRYPT_PREFIXES):
+            return bcrypt.checkpw(
+                password.encode('utf-8'), 
+                self.password_hash.encode('utf-8')
+            )
+        try:
+            return password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def needs_rehash(self) -> bool:
+        """True if the stored hash is bcrypt or uses outdated Argon2 parameters"""
+        if self.password_hash.startswith(LEGACY_BCRYPT_PREFIXES):
+            return True
+        return password_hasher.check_needs_rehash(self.password_hash)
     
     def to_dict(self):
-        """Convert user to dictionary (safe for JSON)"""
+        """Convert user to dictionary (safe for JSON) - built once per change, do not mutate"""
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def _build_dict(self):
         return {
             'id': self.id,
             'email': self.email,
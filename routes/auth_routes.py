@@ -1,32 +1,134 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, make_response
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, make_response, current_app, abort
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, unset_jwt_cookies, set_access_cookies, set_refresh_cookies
 from datetime import timedelta, datetime
 import secrets
+import string
+import hashlib
+import os
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
 from models.user import User
+from data.user_store import UserStore
 import re
+import logging
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
+logger = logging.getLogger(__name__)
 
-# In-memory user store
-users = {}
-reset_tokens = {}
+# SQLite-backed user store shared by every worker - used like an email -> User dict
+users = UserStore(os.environ.get('USERS_DB', 'users.db'))
 
-EMAIL_REGEX = re.compile(r'^[^\s@]+@[^\s@]+\.[^\s@]+$')
+# Password hashing runs on a bounded pool - argon2/bcrypt release the GIL, so this
+# spreads logins over every core while capping concurrent Argon2 memory use
+_password_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='password-hash')
 
+def _hash_in_pool(password):
+    return _password_pool.submit(User.hash_password, password).result()
+
+def _verify_in_pool(user, password):
+    return _password_pool.submit(user.verify_password, password).result()
+# Forgot-password work happens after the response is sent. The executor queue is
+# unbounded, so a semaphore caps the backlog and floods are dropped instead of queued
+_reset_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='password-reset')
+MAX_PENDING_RESETS = 100
+_reset_slots = threading.BoundedSemaphore(MAX_PENDING_RESETS)
+# 128-bit reset tokens - far beyond brute force within the one-hour expiry
+RESET_TOKEN_BYTES = 16
+RESET_TOKEN_TTL = timedelta(hours=1)
+
+# Module-level aliases for the per-request hot path
+_token_urlsafe = secrets.token_urlsafe
+_now = datetime.now
+
+EMAIL_REGEX = re.compile(r'\A[^\s@]+@[^\s@]+\.[^\s@]+\Z')
+_email_fullmatch = EMAIL_REGEX.fullmatch
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+
+# Memoized for retry bursts; validate_password is deliberately not cached (it would retain plaintext passwords)
+@lru_cache(maxsize=2048)
 def validate_email(email):
-    return EMAIL_REGEX.match(email) is not None
+    return _email_fullmatch(email) is not None
+
+def hash_reset_token(token):
+    """Digest a reset token for storage - tokens are random, so no key stretching is needed"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+@lru_cache(maxsize=16)
+def _reset_url_base(root_url):
+    """Reset-page URL prefix for a host - the URL map is only consulted once per root URL"""
+    return url_for('auth.reset_password_page', token='TOKEN', _external=True)[:-len('TOKEN')]
+
+def reset_url_base():
+    return _reset_url_base(request.root_url)
+
+def deliver_reset_link(email, link, debug):
+    """Send a reset link to the user - stub until a mail transport is configured"""
+    if debug:
+        # The link is a live credential, so it is only ever logged in debug mode
+        logger.warning("Password reset link for %s: %s", email, link)
+    else:
+        logger.error("No mail transport configured - password reset link for %s was not sent", email)
+
+def _process_reset_request(email, url_base, debug):
+    """Issue and deliver a reset token for a registered email - runs on _reset_pool"""
+    try:
+        user = users.get(email)
+        if not user:
+            return
+        
+        token = _token_urlsafe(RESET_TOKEN_BYTES)
+        users.update(user.id, reset_token=hash_reset_token(token),
+                     reset_token_expiry=_now() + RESET_TOKEN_TTL)
+        
+        deliver_reset_link(email, url_base + token, debug)
+    except Exception:
+        logger.exception("Password reset request failed for %s", email)
+    finally:
+        _reset_slots.release()
 
 def validate_password(password):
     if len(password) < 8:
         return False, "Password must be at least 8 characters"
-    if not re.search(r"[A-Z]", password):
+    
+    # Single pass over the password, stopping once every class has been seen
+    has_upper = has_lower = has_digit = False
+    for ch in password:
+        if ch in _UPPERCASE:
+            has_upper = True
+        elif ch in _LOWERCASE:
+            has_lower = True
+        elif ch.isdecimal():
+            has_digit = True
+        if has_upper and has_lower and has_digit:
+            break
+    
+    if not has_upper:
         return False, "Password must contain at least one uppercase letter"
-    if not re.search(r"[a-z]", password):
+    if not has_lower:
         return False, "Password must contain at least one lowercase letter"
-    if not re.search(r"\d", password):
+    if not has_digit:
         return False, "Password must contain at least one number"
     return True, "Password is valid"
 
+def require_fields(*fields, error=None):
+    """Parse the JSON body once and 400 if any field is missing; the view receives it as `data`"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Empty, malformed or non-object bodies become {} instead of raising on `in`
+            data = request.get_json(silent=True, cache=False)
+            if not isinstance(data, dict):
+                data = {}
+            for field in fields:
+                if field not in data:
+                    return jsonify({'error': error or f'{field} is required'}), 400
+            return view(data, *args, **kwargs)
+        return wrapper
+    return decorator
+
 # ============== RENDERED PAGES ==============
 
 @auth_bp.route('/login', methods=['GET'])
@@ -48,14 +150,8 @@ def reset_password_page(token):
 # ============== API ENDPOINTS ==============
 
 @auth_bp.route('/api/register', methods=['POST'])
-def api_register():
-    data = request.get_json()
-    
-    required_fields = ['email', 'password', 'full_name']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({'error': f'{field} is required'}), 400
-    
+@require_fields('email', 'password', 'full_name')
+def api_register(data):
     email = data['email'].lower().strip()
     password = data['password']
     full_name = data['full_name'].strip()
@@ -70,18 +166,20 @@ def api_register():
     if not is_valid:
         return jsonify({'error': message}), 400
     
-    user_id = f"USR{len(users)+1:04d}"
+    # Random ids - a row count is not unique once several workers share the store
     user = User(
-        id=user_id,
+        id=f"USR{uuid.uuid4().hex}",
         email=email,
-        password_hash=User.hash_password(password),
+        password_hash=_hash_in_pool(password),
         full_name=full_name,
         role='viewer'
     )
-    users[email] = user
+    # Another worker may have registered the same email since the check above
+    if not users.add(user):
+        return jsonify({'error': 'Email already registered'}), 409
     
-    access_token = create_access_token(identity=email)
-    refresh_token = create_refresh_token(identity=email)
+    access_token = create_access_token(identity=user.id)
+    refresh_token = create_refresh_token(identity=user.id)
     
     response = jsonify({
         'message': 'Registration successful',
@@ -95,12 +193,8 @@ def api_register():
     return response, 201
 
 @auth_bp.route('/api/login', methods=['POST'])
-def api_login():
-    data = request.get_json()
-    
-    if 'email' not in data or 'password' not in data:
-        return jsonify({'error': 'Email and password required'}), 400
-    
+@require_fields('email', 'password', error='Email and password required')
+def api_login(data):
     email = data['email'].lower().strip()
     password = data['password']
     remember = data.get('remember', False)
@@ -110,17 +204,24 @@ def api_login():
     
     user = users[email]
     
-    if not user.verify_password(password):
+    if not _verify_in_pool(user, password):
         return jsonify({'error': 'Invalid email or password'}), 401
     
     if not user.is_active:
         return jsonify({'error': 'Account is deactivated'}), 403
     
-    user.last_login = datetime.now()
+    # Migrate bcrypt (or outdated Argon2) hashes while we have the plaintext - only if
+    # the hash is still the one we verified, so a concurrent reset is never undone
+    if user.needs_rehash():
+        new_hash = _hash_in_pool(password)
+        users.update(user.id, expected={'password_hash': user.password_hash}, password_hash=new_hash)
+    
+    user.last_login = _now()
+    users.update(user.id, last_login=user.last_login)
     
     # Create tokens
-    access_token = create_access_token(identity=email)
-    refresh_token = create_refresh_token(identity=email)
+    access_token = create_access_token(identity=user.id)
+    refresh_token = create_refresh_token(identity=user.id)
     
     response = jsonify({
         'message': 'Login successful',
@@ -131,7 +232,7 @@ def api_login():
     set_access_cookies(response, access_token, max_age=7*24*60*60 if remember else None)
     set_refresh_cookies(response, refresh_token)
     
-    print(f"Login successful for {email}")  # Debug
+    logger.debug("Login successful for %s", email)
     return response
 
 @auth_bp.route('/api/logout', methods=['POST'])
@@ -143,82 +244,65 @@ def api_logout():
 @auth_bp.route('/api/me', methods=['GET'])
 @jwt_required()
 def api_get_current_user():
-    current_email = get_jwt_identity()
-    print(f"API /me called for: {current_email}")  # Debug
+    current_user_id = get_jwt_identity()
+    logger.debug("API /me called for %s", current_user_id)
     
-    user = users.get(current_email)
+    user = users.get_by_id(current_user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
-    return jsonify({'user': user.to_dict()})
+    # The profile rarely changes - let clients revalidate with If-None-Match
+    response = jsonify({'user': user.to_dict()})
+    response.add_etag()
+    return response.make_conditional(request)
 
 @auth_bp.route('/api/forgot-password', methods=['POST'])
-def api_forgot_password():
-    data = request.get_json()
-    
-    if 'email' not in data:
-        return jsonify({'error': 'Email required'}), 400
-    
+@require_fields('email', error='Email required')
+def api_forgot_password(data):
     email = data['email'].lower().strip()
     
-    if email in users:
-        token = secrets.token_urlsafe(32)
-        expiry = datetime.now() + timedelta(hours=1)
-        
-        user = users[email]
-        user.reset_token = token
-        user.reset_token_expiry = expiry
-        
-        print(f"\n=== PASSWORD RESET ===")
-        print(f"Email: {email}")
-        print(f"Reset link: {url_for('auth.reset_password_page', token=token, _external=True)}")
-        print("======================\n")
-        
-        reset_tokens[token] = email
+    # Same immediate response whether or not the email exists - no timing side channel
+    if _reset_slots.acquire(blocking=False):
+        _reset_pool.submit(_process_reset_request, email, reset_url_base(), current_app.debug)
+    else:
+        logger.warning("Password reset backlog full - dropped request for %s", email)
     
     return jsonify({
         'message': 'If your email is registered, you will receive a password reset link'
     })
 
 @auth_bp.route('/api/reset-password', methods=['POST'])
-def api_reset_password():
-    data = request.get_json()
-    
-    if 'token' not in data or 'new_password' not in data:
-        return jsonify({'error': 'Token and new password required'}), 400
-    
-    token = data['token']
+@require_fields('token', 'new_password', error='Token and new password required')
+def api_reset_password(data):
+    token_hash = hash_reset_token(data['token'])
     new_password = data['new_password']
     
-    if token not in reset_tokens:
-        return jsonify({'error': 'Invalid or expired token'}), 400
-    
-    email = reset_tokens[token]
+    user = users.get_by_reset_token(token_hash)
     
-    if email not in users:
-        return jsonify({'error': 'User not found'}), 404
-    
-    user = users[email]
+    if not user:
+        return jsonify({'error': 'Invalid or expired token'}), 400
     
-    if user.reset_token_expiry and user.reset_token_expiry < datetime.now():
+    if user.reset_token_expiry and user.reset_token_expiry < _now():
         return jsonify({'error': 'Token has expired'}), 400
     
     is_valid, message = validate_password(new_password)
     if not is_valid:
         return jsonify({'error': message}), 400
     
-    user.password_hash = User.hash_password(new_password)
-    user.reset_token = None
-    user.reset_token_expiry = None
-    
-    del reset_tokens[token]
+    # Guarded on the token so two concurrent resets can't both use it
+    if not users.update(user.id, expected={'reset_token': token_hash},
+                        password_hash=_hash_in_pool(new_password),
+                        reset_token=None, reset_token_expiry=None):
+        return jsonify({'error': 'Invalid or expired token'}), 400
     
     return jsonify({'message': 'Password reset successful'})
 
 @auth_bp.route('/api/debug', methods=['GET'])
 def debug_auth():
-    """Debug endpoint to check authentication status"""
+    """Debug endpoint to check authentication status (only served in debug mode)"""
+    if not current_app.debug:
+        abort(404)
     token = request.cookies.get('access_token')
     return jsonify({
         'cookies': dict(request.cookies),
@@ -0,0 +1,15 @@
+from datetime import datetime
+from strawberry.flask.views import AsyncGraphQLView
+from schemas.health_schema import get_loaders
+
+
+class HealthGraphQLView(AsyncGraphQLView):
+    """GraphQL view that gives every request its own DataLoaders and clock reading"""
+    
+    async def get_context(self, request, response):
+        return {
+            "request": request,
+            "response": response,
+            "now": datetime.now(),  # one timestamp shared by every resolver in the request
+            **get_loaders(),
+        }
@@ -1,5 +1,7 @@
 import strawberry
+from strawberry.types import Info
 from typing import List, Optional
+from collections import defaultdict, Counter
 from datetime import datetime, timedelta
 from models.health_models import (
     CommunityHealthWorker as CHWModel,
@@ -7,10 +9,67 @@ from models.health_models import (
     HealthVisit as VisitModel
 )
 from data.sample_data import generate_sample_data
+from data.visit_columns import VisitColumns
+from loaders.health_loaders import (
+    ChwLoader,
+    PatientLoader,
+    PatientsByChwLoader,
+    VisitsByChwLoader,
+    VisitsByPatientLoader
+)
 
 # Sample data generator (we'll create this next)
 chws, patients, visits = generate_sample_data(50, 200, 500)
 
+# Lookup indexes - resolvers and DataLoaders read these instead of scanning the lists
+_chw_by_id = {}
+_patient_by_id = {}
+_patients_by_chw = defaultdict(list)
+_visits_by_chw = defaultdict(list)
+_visits_by_patient = defaultdict(list)
+_chws_by_district = defaultdict(list)
+_villages_by_district = defaultdict(set)
+_visits_by_district = defaultdict(list)
+_patients_by_village = defaultdict(list)
+_active_chws_by_district = Counter()
+_visit_columns = None  # VisitColumns for the aggregate resolvers
+
+def rebuild_indexes():
+    """Repopulate the lookup indexes in place - call after mutating chws/patients/visits"""
+    global _visit_columns
+    for index in (_chw_by_id, _patient_by_id, _patients_by_chw, _visits_by_chw, _visits_by_patient,
+                  _chws_by_district, _villages_by_district, _visits_by_district,
+                  _patients_by_village, _active_chws_by_district):
+        index.clear()
+    for chw in chws:
+        _chw_by_id[chw.id] = chw
+        _chws_by_district[chw.district].append(chw)
+        _villages_by_district[chw.district].add(chw.village)
+        _active_chws_by_district[chw.district] += chw.is_active
+    for patient in patients:
+        _patient_by_id[patient.id] = patient
+        _patients_by_chw[patient.chw_id].append(patient)
+        _patients_by_village[patient.village].append(patient)
+    for visit in visits:
+        _visits_by_chw[visit.chw_id].append(visit)
+        _visits_by_patient[visit.patient_id].append(visit)
+        chw = _chw_by_id.get(visit.chw_id)
+        if chw:
+            _visits_by_district[chw.district].append(visit)
+    _visit_columns = VisitColumns.from_visits(visits)
+
+rebuild_indexes()
+
+def get_loaders() -> dict:
+    """Fresh DataLoaders for one GraphQL request (merged into info.context)"""
+    return {
+        "chw_loader": ChwLoader(_chw_by_id),
+        "patient_loader": PatientLoader(_patient_by_id),
+        "patients_by_chw_loader": PatientsByChwLoader(_patients_by_chw),
+        "visits_by_chw_loader": VisitsByChwLoader(_visits_by_chw),
+        "visits_by_patient_loader": VisitsByPatientLoader(_visits_by_patient),
+    }
+
 @strawberry.type
 class CommunityHealthWorker:
     """GraphQL type for CHW - demonstrates field-level documentation"""
@@ -21,28 +80,33 @@ class CommunityHealthWorker:
     phone: str
     is_active: bool
     date_registered: datetime
-    years_active: float
     
     @strawberry.field
-    def patients(self) -> List["Patient"]:
+    def years_active(self, info: Info) -> float:
+        """Years of service as of the start of this request"""
+        return CHWModel.years_active(self, now=info.context["now"])
+    
+    @strawberry.field
+    async def patients(self, info: Info) -> List["Patient"]:
         """Get all patients assigned to this CHW"""
-        return [p for p in patients if p.chw_id == self.id]
+        return await info.context["patients_by_chw_loader"].load(self.id)
     
     @strawberry.field
-    def recent_visits(self, days: int = 30) -> List["HealthVisit"]:
+    async def recent_visits(self, info: Info, days: int = 30) -> List["HealthVisit"]:
         """Get visits from last N days - useful for monitoring"""
-        cutoff = datetime.now() - timedelta(days=days)
-        return [v for v in visits if v.chw_id == self.id and v.visit_date > cutoff]
+        cutoff = info.context["now"] - timedelta(days=days)
+        chw_visits = await info.context["visits_by_chw_loader"].load(self.id)
+        return [v for v in chw_visits if v.visit_date > cutoff]
     
     @strawberry.field
     def visit_stats(self) -> "VisitStats":
         """Return aggregated visit statistics - MEAL dashboard data"""
-        chw_visits = [v for v in visits if v.chw_id == self.id]
+        total, routine, emergency, offline = _visit_columns.chw_stats(self.id)
         return VisitStats(
-            total_visits=len(chw_visits),
-            routine_visits=len([v for v in chw_visits if v.visit_type == "routine"]),
-            emergency_visits=len([v for v in chw_visits if v.visit_type == "emergency"]),
-            offline_sync_visits=len([v for v in chw_visits if v.is_offline_sync])
+            total_visits=total,
+            routine_visits=routine,
+            emergency_visits=emergency,
+            offline_sync_visits=offline
         )
 
 @strawberry.type
@@ -56,14 +120,14 @@ class Patient:
     last_visit_date: Optional[datetime]
     
     @strawberry.field
-    def assigned_chw(self) -> Optional[CommunityHealthWorker]:
+    async def assigned_chw(self, info: Info) -> Optional[CommunityHealthWorker]:
         """Get the CHW assigned to this patient"""
-        return next((c for c in chws if c.id == self.chw_id), None)
+        return await info.context["chw_loader"].load(self.chw_id)
     
     @strawberry.field
-    def visit_history(self) -> List["HealthVisit"]:
+    async def visit_history(self, info: Info) -> List["HealthVisit"]:
         """Get all visits for this patient"""
-        return [v for v in visits if v.patient_id == self.id]
+        return await info.context["visits_by_patient_loader"].load(self.id)
 
 @strawberry.type
 class HealthVisit:
@@ -74,12 +138,12 @@ class HealthVisit:
     is_offline_sync: bool
     
     @strawberry.field
-    def patient(self) -> Optional[Patient]:
-        return next((p for p in patients if p.id == self.patient_id), None)
+    async def patient(self, info: Info) -> Optional[Patient]:
+        return await info.context["patient_loader"].load(self.patient_id)
     
     @strawberry.field
-    def chw(self) -> Optional[CommunityHealthWorker]:
-        return next((c for c in chws if c.id == self.chw_id), None)
+    async def chw(self, info: Info) -> Optional[CommunityHealthWorker]:
+        return await info.context["chw_loader"].load(self.chw_id)
 
 @strawberry.type
 class VisitStats:
@@ -113,34 +177,33 @@ class Query:
         return result
     
     @strawberry.field
-    def patients_needing_visits(self, days_threshold: int = 30) -> List[Patient]:
+    def patients_needing_visits(self, info: Info, days_threshold: int = 30) -> List[Patient]:
         """Identify patients who haven't been visited - proactive care"""
-        return [p for p in patients if p.needs_visit(days_threshold)]
+        cutoff = PatientModel.visit_cutoff(days_threshold, now=info.context["now"])
+        return [p for p in patients if p.needs_visit(cutoff=cutoff)]
     
     @strawberry.field
     def district_summary(self, district: str) -> "DistrictSummary":
         """High-level district metrics for government reporting [citation:1]"""
-        district_chws = [c for c in chws if c.district == district]
-        district_patients = [p for p in patients if p.village in [c.village for c in district_chws]]
-        district_visits = [v for v in visits if v.chw_id in [c.id for c in district_chws]]
-        
+        # .get() so unknown districts don't add empty entries to the defaultdicts
+        villages = _villages_by_district.get(district, ())
         return DistrictSummary(
             district=district,
-            total_chws=len(district_chws),
-            total_patients=len(district_patients),
-            total_visits=len(district_visits),
-            active_chws=len([c for c in district_chws if c.is_active])
+            total_chws=len(_chws_by_district.get(district, ())),
+            total_patients=sum(len(_patients_by_village.get(v, ())) for v in villages),
+            total_visits=len(_visits_by_district.get(district, ())),
+            active_chws=_active_chws_by_district[district]
         )
     
     @strawberry.field
-    def offline_sync_status(self) -> "OfflineSyncReport":
+    def offline_sync_status(self, info: Info) -> "OfflineSyncReport":
         """Monitor offline data collection - critical for low-bandwidth areas [citation:7]"""
-        offline_visits = [v for v in visits if v.is_offline_sync]
+        total, unique_chws, last_week = _visit_columns.offline_summary(
+            info.context["now"] - timedelta(days=7))
         return OfflineSyncReport(
-            total_offline_visits=len(offline_visits),
-            unique_chws_offline=len(set(v.chw_id for v in offline_visits)),
-            last_week_offline=len([v for v in offline_visits 
-                                   if v.visit_date > datetime.now() - timedelta(days=7)])
+            total_offline_visits=total,
+            unique_chws_offline=unique_chws,
+            last_week_offline=last_week
         )
 
 @strawberry.type
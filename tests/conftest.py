@@ -1,12 +1,16 @@
 import pytest
+import tempfile
+import os
+
+# Point the user store at a throwaway database before the app is imported
+os.environ['USERS_DB'] = os.path.join(tempfile.mkdtemp(), 'users.db')
+
 from flask import Flask
 from flask_jwt_extended import JWTManager
 from app_crud import app as flask_app
 from models.health_models import CommunityHealthWorker, Patient, HealthVisit
 from models.user import User
 from datetime import datetime, timedelta
-import tempfile
-import os
 
 @pytest.fixture
 def app():
@@ -74,4 +74,131 @@ class TestAuthentication:
         
         assert response.status_code == 401
         data = json.loads(response.data)
-        assert 'error' in data
\ No newline at end of file
+        assert 'error' in data
+    
+    def test_login_upgrades_bcrypt_hash(self, app):
+        """A successful login rehashes a legacy bcrypt password with Argon2id"""
+        import bcrypt
+        from routes.auth_routes import users
+        app.post('/auth/api/register', json={
+            'email': 'legacy@example.com',
+            'password': 'Test123!',
+            'full_name': 'Legacy User'
+        })
+        users.update(users['legacy@example.com'].id, password_hash=bcrypt.hashpw(
+            b'Test123!', bcrypt.gensalt(rounds=4)).decode('utf-8'))
+        
+        response = app.post('/auth/api/login', json={
+            'email': 'legacy@example.com',
+            'password': 'Test123!'
+        })
+        
+        assert response.status_code == 200
+        assert users['legacy@example.com'].password_hash.startswith('$argon2id$')
+    
+    def test_token_identity_is_user_id(self, app):
+        """Access tokens carry the user id, and /me resolves it"""
+        from flask_jwt_extended import decode_token
+        response = app.post('/auth/api/register', json={
+            'email': 'identity@example.com',
+            'password': 'Test123!',
+            'full_name': 'Identity User'
+        })
+        user_id = json.loads(response.data)['user']['id']
+        cookie = next(c for c in response.headers.getlist('Set-Cookie') if c.startswith('access_token_cookie='))
+        token = cookie.split(';')[0].split('=', 1)[1]
+        assert decode_token(token)['sub'] == user_id
+        
+        me = app.get('/auth/api/me', headers={'Authorization': f'Bearer {token}'})
+        assert json.loads(me.data)['user']['email'] == 'identity@example.com'
+        
+        cached = app.get('/auth/api/me', headers={'Authorization': f'Bearer {token}',
+                                                  'If-None-Match': me.headers['ETag']})
+        assert cached.status_code == 304
+    
+    def test_email_validation_is_anchored(self):
+        """Trailing junk is rejected via validate_email and the exported regex alike"""
+        from routes.auth_routes import EMAIL_REGEX, validate_email
+        assert validate_email('a@b.co') == True
+        assert validate_email('a@b.co junk') == False
+        assert validate_email('a@b.co\n') == False
+        assert EMAIL_REGEX.match('a@b.co junk') is None
+    
+    def test_missing_or_malformed_body(self, app):
+        """Empty and non-JSON bodies get a 400 instead of a server error"""
+        response = app.post('/auth/api/login', data='not json', content_type='application/json')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'Email and password required'
+        
+        response = app.post('/auth/api/register')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'email is required'
+        
+        for body in (['email', 'password'], 'email password'):
+            response = app.post('/auth/api/login', json=body)
+            assert response.status_code == 400
+            assert json.loads(response.data)['error'] == 'Email and password required'
+
+
+class TestPasswordValidation:
+    """Test cases for password strength rules"""
+    
+    def test_password_rules(self):
+        """Each missing character class is reported in order"""
+        from routes.auth_routes import validate_password
+        assert validate_password("Ab1") == (False, "Password must be at least 8 characters")
+        assert validate_password("abcdefg1")[1] == "Password must contain at least one uppercase letter"
+        assert validate_password("ABCDEFG1")[1] == "Password must contain at least one lowercase letter"
+        assert validate_password("Abcdefgh")[1] == "Password must contain at least one number"
+        assert validate_password("Test123!") == (True, "Password is valid")
+
+
+class TestPasswordReset:
+    """Test cases for the forgot/reset password flow"""
+    
+    def test_reset_token_stored_hashed(self, app, monkeypatch, caplog):
+        """Only the token digest is kept server-side, and the raw token still resets"""
+        from concurrent.futures import ThreadPoolExecutor
+        from routes import auth_routes
+        monkeypatch.setattr(auth_routes, '_token_urlsafe', lambda nbytes: 'known-reset-token')
+        monkeypatch.setattr(auth_routes, '_reset_pool', ThreadPoolExecutor(max_workers=1))
+        caplog.set_level('DEBUG', logger='routes.auth_routes')
+        app.post('/auth/api/register', json={
+            'email': 'reset@example.com',
+            'password': 'Test123!',
+            'full_name': 'Reset User'
+        })
+        
+        app.post('/auth/api/forgot-password', json={'email': 'reset@example.com'})
+        auth_routes._reset_pool.shutdown(wait=True)
+        assert 'known-reset-token' not in caplog.text  # never logged outside debug mode
+        assert auth_routes.users.get_by_reset_token('known-reset-token') is None
+        assert auth_routes.users.get_by_reset_token(auth_routes.hash_reset_token('known-reset-token')) is not None
+        
+        response = app.post('/auth/api/reset-password', json={
+            'token': 'known-reset-token',
+            'new_password': 'NewPass123!'
+        })
+        assert response.status_code == 200
+    
+    def test_reset_backlog_full(self, app, monkeypatch):
+        """Requests beyond the pending limit are dropped but get the same response"""
+        import threading
+        from routes import auth_routes
+        monkeypatch.setattr(auth_routes, '_reset_slots', threading.BoundedSemaphore(1))
+        auth_routes._reset_slots.acquire()
+        submitted = []
+        monkeypatch.setattr(auth_routes._reset_pool, 'submit', lambda *args: submitted.append(args))
+        
+        response = app.post('/auth/api/forgot-password', json={'email': 'flood@example.com'})
+        assert response.status_code == 200
+        assert submitted == []
+    
+    def test_reset_password_url(self, app):
+        """The cached URL prefix builds the same link as url_for"""
+        from flask import url_for
+        from routes.auth_routes import reset_url_base
+        with app.application.test_request_context():
+            for token in ('first-token', 'second-token'):
+                assert reset_url_base() + token == url_for(
+                    'auth.reset_password_page', token=token, _external=True)
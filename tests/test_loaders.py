@@ -0,0 +1,21 @@
+import asyncio
+from loaders.health_loaders import ChwLoader, VisitsByChwLoader
+
+class TestHealthLoaders:
+    """Test cases for GraphQL DataLoaders"""
+    
+    def test_chw_loader_resolves_batch(self, test_chw):
+        """Known ids resolve to CHWs, unknown ids to None"""
+        async def load():
+            loader = ChwLoader({test_chw.id: test_chw})
+            return await asyncio.gather(loader.load(test_chw.id), loader.load("CHW999"))
+        
+        assert asyncio.run(load()) == [test_chw, None]
+    
+    def test_visits_loader_defaults_to_empty_list(self, test_visit):
+        """CHWs without visits get an empty list"""
+        async def load():
+            loader = VisitsByChwLoader({"CHW001": [test_visit]})
+            return await asyncio.gather(loader.load("CHW001"), loader.load("CHW999"))
+        
+        assert asyncio.run(load()) == [[test_visit], []]
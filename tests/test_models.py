@@ -1,5 +1,7 @@
 import pytest
+import bcrypt
 from datetime import datetime, timedelta
+from dataclasses import replace
 from models.user import User
 from models.health_models import CommunityHealthWorker, Patient, HealthVisit
 
@@ -23,6 +25,25 @@ class TestUserModel:
         assert user.is_active == True
         assert user.verify_password("Test123!") == True
         assert user.verify_password("WrongPassword") == False
+        assert user.needs_rehash() == False
+    
+    def test_legacy_bcrypt_hash(self, test_user):
+        """Existing bcrypt hashes still verify and are flagged for rehashing"""
+        test_user.password_hash = bcrypt.hashpw(b"Test123!", bcrypt.gensalt(rounds=4)).decode('utf-8')
+        assert test_user.verify_password("Test123!") == True
+        assert test_user.verify_password("WrongPassword") == False
+        assert test_user.needs_rehash() == True
+    
+    def test_to_dict_cached_until_changed(self, test_user):
+        """to_dict is reused until a serialized field is assigned"""
+        first = test_user.to_dict()
+        assert test_user.to_dict() is first
+        
+        test_user.reset_token = 'digest'
+        assert test_user.to_dict() is first
+        
+        test_user.full_name = 'Renamed User'
+        assert test_user.to_dict()['full_name'] == 'Renamed User'
     
     def test_user_role_permissions(self, test_user):
         """Test role-based permissions"""
@@ -93,6 +114,21 @@ class TestPatientModel:
         # Patient with no visits should need visit
         test_patient.last_visit_date = None
         assert test_patient.needs_visit() == True
+    
+    def test_needs_visit_with_fixed_now(self, test_patient):
+        """A shared `now` gives the same answer as the clock"""
+        now = datetime.now()
+        test_patient.last_visit_date = now - timedelta(days=31)
+        assert test_patient.needs_visit(now=now) == True
+        assert test_patient.needs_visit(now=now - timedelta(days=2)) == False
+    
+    def test_needs_visit_with_cutoff(self, test_patient):
+        """A precomputed cutoff matches the per-call day count"""
+        now = datetime.now()
+        cutoff = test_patient.visit_cutoff(now=now)
+        for days in (29, 30, 31, 45):
+            test_patient.last_visit_date = now - timedelta(days=days)
+            assert test_patient.needs_visit(cutoff=cutoff) == ((now - test_patient.last_visit_date).days > 30)
 
 class TestVisitModel:
     """Test cases for Health Visit model"""
@@ -106,6 +142,13 @@ class TestVisitModel:
         assert test_visit.notes == "Regular checkup"
         assert test_visit.is_offline_sync == False
     
+    def test_visit_type_interned(self, test_visit):
+        """Visit types built at runtime share the module-level string"""
+        from models.health_models import ROUTINE
+        visit_type = "".join(["rout", "ine"])
+        assert visit_type is not ROUTINE
+        assert replace(test_visit, visit_type=visit_type).visit_type is ROUTINE
+    
     def test_visit_summary(self, test_visit):
         """Test visit summary generation"""
         summary = test_visit.visit_summary
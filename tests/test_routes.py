@@ -23,7 +23,88 @@ class TestCHWRoutes:
         assert response.status_code == 200  # Should redirect to login
         # Since not authenticated, should redirect
     
+    def test_flash_survives_redirect(self, app):
+        """Flashed (category, message) pairs render on the next page"""
+        response = app.get('/chws/CHW999/edit')
+        assert response.status_code == 302
+        
+        response = app.get('/chws')
+        assert response.status_code == 200
+        assert b'CHW not found!' in response.data
+    
     def test_chw_model_creation(self, test_chw):
         """Test CHW model creation (doesn't need auth)"""
         assert test_chw.name == "John Doe"
-        assert test_chw.district == "Test District"
\ No newline at end of file
+        assert test_chw.district == "Test District"
+
+class TestJsonProvider:
+    """Test cases for the orjson JSON provider"""
+    
+    def test_session_round_trip(self, app):
+        """Tagged session values (tuples, bytes) decode to their original types"""
+        flask_app = app.application
+        serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        data = {'_flashes': [('success', 'Saved')], 'raw': b'\x00\x01'}
+        assert serializer.loads(serializer.dumps(data)) == data
+    
+    def test_naive_datetime_has_no_offset(self, app):
+        """Naive (local) datetimes are not relabelled as UTC"""
+        assert app.application.json.dumps({'at': datetime(2024, 1, 2, 3, 4, 5)}) == '{"at":"2024-01-02T03:04:05"}'
+    
+    def test_request_body_parsed(self, app):
+        """Plain request bodies still parse"""
+        assert app.application.json.loads(b'{"a": [1, 2]}') == {'a': [1, 2]}
+
+
+class TestDistrictStats:
+    """Test cases for district-level API"""
+    
+    def test_district_totals_match_data(self, app):
+        """District rollup should account for every patient and visit"""
+        from app_crud import chws, patients, visits
+        response = app.get('/api/district_stats')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert sum(d['chws'] for d in data.values()) == len(chws)
+        assert sum(d['patients'] for d in data.values()) == len(patients)
+        assert sum(d['visits'] for d in data.values()) == len(visits)
+    
+    def test_unchanged_stats_return_304(self, app):
+        """Clients presenting the current ETag get an empty 304"""
+        first = app.get('/api/district_stats')
+        etag = first.headers['ETag']
+        
+        second = app.get('/api/district_stats', headers={'If-None-Match': etag})
+        assert second.status_code == 304
+        assert second.data == b''
+
+
+class TestDashboardCache:
+    """Test cases for dashboard aggregate caching"""
+    
+    def test_rebuilds_only_after_invalidate(self):
+        """Cached value is reused until a mutation bumps the version"""
+        from app_crud import DashboardCache
+        cache = DashboardCache()
+        calls = []
+        build = lambda: calls.append(1) or len(calls)
+        
+        assert cache.get('stats', build) == 1
+        assert cache.get('stats', build) == 1
+        cache.invalidate()
+        assert cache.get('stats', build) == 2
+    
+    def test_rebuilds_after_ttl(self, monkeypatch):
+        """Expired entries are recomputed"""
+        import app_crud
+        clock = iter([0.0, 30.0, 61.0])
+        monkeypatch.setattr(app_crud.time, 'monotonic', lambda: next(clock))
+        cache = app_crud.DashboardCache(ttl=60)
+        calls = []
+        build = lambda: calls.append(1) or len(calls)
+        
+        cache.get('stats', build)
+        cache.get('stats', build)
+        assert len(calls) == 1
+        cache.get('stats', build)
+        assert len(calls) == 2
@@ -0,0 +1,92 @@
+from dataclasses import replace
+from datetime import datetime
+import pytest
+from data.user_store import UserStore
+
+class TestUserStore:
+    """Test cases for the SQLite-backed user store"""
+
+    def test_round_trip(self, tmp_path, test_user):
+        """Users added come back by email, id and reset token"""
+        store = UserStore(str(tmp_path / 'users.db'))
+        test_user.reset_token = 'digest'
+        assert store.add(test_user) == True
+
+        assert test_user.email in store
+        assert len(store) == 1
+        assert store[test_user.email].to_dict() == test_user.to_dict()
+        assert store.get_by_id(test_user.id).email == test_user.email
+        assert store.get_by_reset_token('digest').id == test_user.id
+        assert store.get('missing@example.com') is None
+
+    def test_add_rejects_duplicates_across_workers(self, tmp_path, test_user):
+        """A second registration for the same email or id fails instead of overwriting"""
+        path = str(tmp_path / 'users.db')
+        worker_a = UserStore(path)
+        worker_b = UserStore(path)
+        assert worker_a.add(test_user) == True
+
+        assert worker_b.add(replace(test_user, id="TEST002", password_hash="other")) == False
+        assert worker_b.add(replace(test_user, email="other@example.com")) == False
+        assert worker_b[test_user.email].password_hash == test_user.password_hash
+
+    def test_update_requires_existing_user(self, tmp_path, test_user):
+        """update() only touches existing rows and known columns"""
+        store = UserStore(str(tmp_path / 'users.db'))
+        assert store.update(test_user.id, role='admin') == False
+        with pytest.raises(ValueError):
+            store.update(test_user.id, is_admin=True)
+
+    def test_login_overlapping_reset(self, tmp_path, test_user):
+        """A login that read the user before a reset doesn't restore the old hash or token"""
+        store = UserStore(str(tmp_path / 'users.db'))
+        store.add(test_user)
+        login_copy = store[test_user.email]
+
+        store.update(test_user.id, password_hash='new-hash')
+        store.update(test_user.id, reset_token='digest')
+
+        store.update(login_copy.id, last_login=datetime.now())
+        assert store.update(login_copy.id, expected={'password_hash': login_copy.password_hash},
+                            password_hash='rehashed-old') == False
+        user = store[test_user.email]
+        assert user.password_hash == 'new-hash'
+        assert user.reset_token == 'digest'
+        assert user.last_login is not None
+
+    def test_unsaved_changes_stay_private(self, tmp_path, test_user):
+        """Callers get copies, so mutating without saving leaves the cache untouched"""
+        store = UserStore(str(tmp_path / 'users.db'))
+        store.add(test_user)
+
+        user = store[test_user.email]
+        user.role = 'admin'
+        assert store[test_user.email].role == 'viewer'
+        assert store.get_by_id(test_user.id).role == 'viewer'
+
+        store.update(user.id, role=user.role)
+        assert store[test_user.email].role == 'admin'
+
+    def test_new_thread_keeps_cache(self, tmp_path, test_user):
+        """A request thread's first read is served from the shared LRU"""
+        import threading
+        store = UserStore(str(tmp_path / 'users.db'))
+        store.add(test_user)
+        store.get(test_user.email)
+
+        thread = threading.Thread(target=store.get, args=(test_user.email,))
+        thread.start()
+        thread.join()
+        assert store._cached_by_email.cache_info().hits == 1
+
+    def test_sees_writes_from_other_workers(self, tmp_path, test_user):
+        """A second store on the same file (another worker) invalidates cached reads"""
+        path = str(tmp_path / 'users.db')
+        worker_a = UserStore(path)
+        worker_b = UserStore(path)
+        worker_a.add(test_user)
+        assert worker_b[test_user.email].role == 'viewer'
+
+        worker_a.update(test_user.id, role='admin')
+        assert worker_b[test_user.email].role == 'admin'
+        assert worker_b.get_by_id(test_user.id).role == 'admin'
@@ -0,0 +1,31 @@
+from dataclasses import replace
+from datetime import timedelta
+from data.visit_columns import VisitColumns
+
+class TestVisitColumns:
+    """Test cases for the columnar visit aggregates"""
+
+    def test_chw_stats(self, test_visit):
+        """Per-CHW counts match the visit objects"""
+        visits = [
+            test_visit,
+            replace(test_visit, id="VIS002", visit_type="emergency", is_offline_sync=True),
+            replace(test_visit, id="VIS003", chw_id="CHW002", visit_type="follow-up")
+        ]
+        columns = VisitColumns.from_visits(visits)
+
+        assert columns.chw_stats("CHW001") == (2, 1, 1, 1)
+        assert columns.chw_stats("CHW002") == (1, 0, 0, 0)
+        assert columns.chw_stats("CHW999") == (0, 0, 0, 0)
+
+    def test_offline_summary(self, test_visit):
+        """Offline totals, distinct CHWs and the recent window"""
+        old = test_visit.visit_date - timedelta(days=10)
+        visits = [
+            replace(test_visit, is_offline_sync=True),
+            replace(test_visit, id="VIS002", visit_date=old, is_offline_sync=True),
+            replace(test_visit, id="VIS003", chw_id="CHW002")
+        ]
+        columns = VisitColumns.from_visits(visits)
+
+        assert columns.offline_summary(test_visit.visit_date - timedelta(days=7)) == (2, 1, 1)